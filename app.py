@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional
 
+import queue
+import sqlite3
 import subprocess
+import threading
 
 from flask import (
     Flask,
@@ -16,6 +19,7 @@ from flask import (
     request,
     url_for,
 )
+from jinja2 import FileSystemBytecodeCache
 
 import database
 from excel_loader import load_excel
@@ -30,21 +34,78 @@ app.config.update(
     EXCEL_PATH=str(EXCEL_PATH),
 )
 
+JINJA_CACHE_DIR = BASE_DIR / ".jinja_cache"
+_template_cache_configured = False
+
+
+def configure_template_cache() -> None:
+    """
+    Cache compiled template bytecode on disk unless templates auto-reload.
+
+    Flask turns auto-reload on for debug mode (``flask run --debug`` or
+    ``python app.py``), so this runs with the first request, once that is
+    settled. A read-only app directory just goes without the disk cache.
+    Only the first call does anything; repeating the setup is harmless.
+    """
+    global _template_cache_configured
+    if _template_cache_configured:
+        return
+    _template_cache_configured = True
+    env = app.jinja_env
+    if env.auto_reload:
+        return
+    try:
+        JINJA_CACHE_DIR.mkdir(exist_ok=True)
+    except OSError:
+        return
+    env.bytecode_cache = FileSystemBytecodeCache(directory=str(JINJA_CACHE_DIR))
+
+
 # -----------------------------------------------------------------------------
 # Database lifecycle helpers
 # -----------------------------------------------------------------------------
 
 
+# Idle connections are pooled per database path and lent to one request at a
+# time, so SQLite keeps its page and statement caches warm even though the
+# development server starts a new thread for every request. Connections beyond
+# the pool size are closed when their request ends.
+DB_POOL_SIZE = 8
+_db_pools: Dict[str, queue.LifoQueue] = {}
+_db_pools_lock = threading.Lock()
+
+
+def _db_pool(path: str) -> queue.LifoQueue:
+    pool = _db_pools.get(path)
+    if pool is None:
+        with _db_pools_lock:
+            pool = _db_pools.setdefault(path, queue.LifoQueue(maxsize=DB_POOL_SIZE))
+    return pool
+
+
 def get_db():
     if "db" not in g:
-        g.db = database.get_connection(Path(app.config["DATABASE"]))
+        path = app.config["DATABASE"]
+        try:
+            conn = _db_pool(path).get_nowait()
+        except queue.Empty:
+            conn = database.get_connection(Path(path), check_same_thread=False)
+        g.db = conn
+        g.db_path = path
     return g.db
 
 
 @app.teardown_appcontext
 def close_db(exc: Optional[BaseException]) -> None:  # pragma: no cover - flask hook
     db = g.pop("db", None)
-    if db is not None:
+    if db is None:
+        return
+    path = g.pop("db_path")
+    try:
+        if db.in_transaction:
+            db.rollback()
+        _db_pool(path).put_nowait(db)
+    except (queue.Full, sqlite3.Error):
         db.close()
 
 
@@ -53,7 +114,23 @@ def close_db(exc: Optional[BaseException]) -> None:  # pragma: no cover - flask
 # -----------------------------------------------------------------------------
 
 
+# Database paths already bootstrapped in this process, keyed like _db_pools.
+_bootstrapped: set[str] = set()
+_bootstrap_lock = threading.Lock()
+
+
 def ensure_bootstrap_data() -> None:
+    path = app.config["DATABASE"]
+    if path in _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if path in _bootstrapped:
+            return
+        _bootstrap_database()
+        _bootstrapped.add(path)
+
+
+def _bootstrap_database() -> None:
     db = get_db()
     database.init_db(db)
     existing_count = db.execute("SELECT COUNT(*) FROM tags").fetchone()[0]
@@ -71,15 +148,16 @@ def ensure_bootstrap_data() -> None:
 
     excel_data = load_excel(excel_file)
     if needs_seed:
-        database.seed_from_excel(db, excel_data.records)
+        database.seed_from_excel(db, excel_data.iter_rows())
     if needs_dropdowns:
         database.upsert_dropdowns(db, excel_data.dropdowns)
 
 
 @app.before_request
 def before_request() -> None:  # pragma: no cover - flask hook
+    configure_template_cache()
     ensure_bootstrap_data()
-    g.dropdown_options = database.fetch_dropdowns(get_db())
+    g.now = database.now_iso()
 
 
 # -----------------------------------------------------------------------------
@@ -163,7 +241,9 @@ FORM_SECTIONS = [
 FIELD_CONFIG = [field for section in FORM_SECTIONS for field in section["fields"]]
 
 SELECT_FIELDS = {field["name"] for field in FIELD_CONFIG if field.get("type") == "select"}
-DATE_FIELDS = {field["name"] for field in FIELD_CONFIG if field.get("type") == "date"}
+
+# (name, is_select) pairs walked by normalize_form_data on every POST.
+_NORM_SCHEMA = tuple((field["name"], field["name"] in SELECT_FIELDS) for field in FIELD_CONFIG)
 
 
 # -----------------------------------------------------------------------------
@@ -173,29 +253,26 @@ DATE_FIELDS = {field["name"] for field in FIELD_CONFIG if field.get("type") == "
 
 def normalize_form_data(form: Dict[str, str]) -> Dict[str, Optional[str]]:
     data: Dict[str, Optional[str]] = {}
-    for field in FIELD_CONFIG:
-        name = field["name"]
-        value = form.get(name)
-        if name in SELECT_FIELDS and value == "__other__":
-            custom_value = form.get(f"{name}_other", "").strip()
-            value = custom_value or None
-        if value is not None:
+    get = form.get
+    # Stripping maps blank values (including empty dates) to None.
+    for name, is_select in _NORM_SCHEMA:
+        value = get(name)
+        if is_select and value == "__other__":
+            value = get(f"{name}_other", "").strip() or None
+        elif value is not None:
             value = value.strip() or None
         data[name] = value
-    # Dates: ensure empty string becomes None
-    for name in DATE_FIELDS:
-        if data.get(name) in {"", None}:
-            data[name] = None
     return data
 
 
-def prepare_form_context(record: Dict[str, Optional[str]]) -> Dict[str, Dict[str, Optional[str]]]:
-    dropdowns = g.dropdown_options
+def prepare_form_context(
+    record: Dict[str, Optional[str]], dropdown_sets: Dict[str, FrozenSet[str]]
+) -> Dict[str, Dict[str, Optional[str]]]:
     select_values = {}
     other_values = {}
     for field in SELECT_FIELDS:
         current = (record.get(field) or "").strip()
-        options = dropdowns.get(field, [])
+        options = dropdown_sets.get(field, frozenset())
         if current and current not in options:
             select_values[field] = "__other__"
             other_values[field] = current
@@ -288,7 +365,7 @@ def dashboard():
     db = get_db()
     stats = database.dashboard_stats(db)
     recent = db.execute(
-        "SELECT * FROM tags ORDER BY (updated_at IS NULL), updated_at DESC LIMIT 8"
+        "SELECT * FROM tags ORDER BY updated_at DESC NULLS LAST LIMIT 8"
     ).fetchall()
     today = date.today()
     default_start = today - timedelta(days=30)
@@ -304,7 +381,7 @@ def dashboard():
         report_rows = database.report_rows_closed(db, start_str, end_str)
     else:
         report_rows = database.report_rows_open(db, start_str, end_str)
-    report_summary = database.report_summary(report_rows)
+    report_summary = database.report_summary(report_rows, closed=report_tab == "closed")
     return render_template(
         "dashboard.html",
         stats=stats,
@@ -316,28 +393,48 @@ def dashboard():
     )
 
 
+def render_tag_list(title: str, view: str, is_closed: Optional[bool]):
+    before = None
+    before_value = request.args.get("before")
+    before_id = request.args.get("before_id", type=int)
+    if before_id is not None:
+        # Without ``before`` the cursor is in the tail of untimestamped tags.
+        before = (before_value or None, before_id)
+    tags, next_cursor = database.list_tags_page(get_db(), is_closed=is_closed, before=before)
+    next_page = None
+    if next_cursor is not None:
+        next_value, next_id = next_cursor
+        next_page = {"before_id": next_id}
+        if next_value is not None:
+            next_page["before"] = next_value
+    return render_template(
+        "tags_list.html",
+        title=title,
+        tags=tags,
+        view=view,
+        next_page=next_page,
+        is_paged=before is not None,
+    )
+
+
 @app.route("/tags")
 def list_all_tags():
-    tags = database.list_tags(get_db())
-    return render_template("tags_list.html", title="All Tags", tags=tags, view="all")
+    return render_tag_list("All Tags", "all", None)
 
 
 @app.route("/tags/open")
 def list_open_tags():
-    tags = database.list_tags(get_db(), is_closed=False)
-    return render_template("tags_list.html", title="Open Tags", tags=tags, view="open")
+    return render_tag_list("Open Tags", "open", False)
 
 
 @app.route("/tags/closed")
 def list_closed_tags():
-    tags = database.list_tags(get_db(), is_closed=True)
-    return render_template("tags_list.html", title="Closed Tags", tags=tags, view="closed")
+    return render_tag_list("Closed Tags", "closed", True)
 
 
 @app.route("/tags/new", methods=["GET", "POST"])
 def create_tag():
     db = get_db()
-    dropdowns = g.dropdown_options
     if request.method == "POST":
         data = normalize_form_data(request.form)
         if not data.get("part_description"):
@@ -345,7 +442,7 @@ def create_tag():
         else:
             if not data.get("tag_number"):
                 data["tag_number"] = database.generate_tag_number(db)
-            tag_id = database.insert_tag(db, data)
+            tag_id = database.insert_tag(db, data, now=g.now)
             report_row = database.report_row_open(db, tag_id)
             if report_row is not None:
                 send_postfix_email(
@@ -361,7 +458,8 @@ def create_tag():
         data = {field["name"]: None for field in FIELD_CONFIG}
         data["tag_number"] = suggested_tag
 
-    form_helpers = prepare_form_context(data)
+    dropdowns, dropdown_sets = database.cached_dropdown_options(db)
+    form_helpers = prepare_form_context(data, dropdown_sets)
     return render_template(
         "tag_form.html",
         form_data=data,
@@ -376,7 +474,6 @@ def create_tag():
 @app.route("/tags/<int:tag_id>/edit", methods=["GET", "POST"])
 def edit_tag(tag_id: int):
     db = get_db()
-    dropdowns = g.dropdown_options
     row = database.get_tag(db, tag_id)
     if row is None:
         abort(404)
@@ -386,7 +483,7 @@ def edit_tag(tag_id: int):
         updated_data = normalize_form_data(request.form)
         updated_data["tag_number"] = data.get("tag_number")
         was_closed = bool(row["is_closed"])
-        database.update_tag(db, tag_id, updated_data)
+        database.update_tag(db, tag_id, updated_data, now=g.now)
         updated_row = database.get_tag(db, tag_id)
         if updated_row is not None and not was_closed and bool(updated_row["is_closed"]):
             report_row = database.report_row_closed(db, tag_id)
@@ -400,7 +497,8 @@ def edit_tag(tag_id: int):
         flash("Tag updated.", "success")
         return redirect(url_for("edit_tag", tag_id=tag_id))
 
-    form_helpers = prepare_form_context(data)
+    dropdowns, dropdown_sets = database.cached_dropdown_options(db)
+    form_helpers = prepare_form_context(data, dropdown_sets)
     return render_template(
         "tag_form.html",
         form_data=data,
@@ -459,10 +557,7 @@ def reseed_command():  # pragma: no cover - CLI helper
     db = get_db()
     excel_file = Path(app.config["EXCEL_PATH"])
     data = load_excel(excel_file)
-    db.execute("DELETE FROM tags")
-    db.execute("DELETE FROM dropdown_options")
-    database.seed_from_excel(db, data.records)
-    database.upsert_dropdowns(db, data.dropdowns)
+    database.reseed(db, data.iter_rows(), data.dropdowns)
     print("Database reseeded from Excel.")
 
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import sqlite3
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 DB_PATH = Path("noncon.db")
 
@@ -38,11 +39,82 @@ TAG_COLUMNS = [
     "updated_at",
 ]
 
+_TAG_COLUMN_SET = frozenset(TAG_COLUMNS)
+_COLUMN_NAMES = ", ".join(TAG_COLUMNS)
+_PLACEHOLDERS = ", ".join("?" for _ in TAG_COLUMNS)
 
-def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
+SEED_SQL = f"INSERT OR IGNORE INTO tags({_COLUMN_NAMES}) VALUES ({_PLACEHOLDERS})"
+INSERT_SQL = f"INSERT INTO tags({_COLUMN_NAMES}) VALUES ({_PLACEHOLDERS})"
+
+# created_at is fixed at insert time and complete is only populated by the
+# Excel import, so edits leave both untouched.
+UPDATE_COLUMNS = tuple(col for col in TAG_COLUMNS if col not in {"created_at", "complete"})
+_ASSIGNMENTS = ", ".join(f"{col} = ?" for col in UPDATE_COLUMNS)
+UPDATE_SQL = f"UPDATE tags SET {_ASSIGNMENTS} WHERE id = ?"
+
+# Primary date used by the reports: containment, authorization or closed date,
+# falling back to created_at.
+REPORT_DATE_EXPR = "date(COALESCE(containment_date, date_authorized, closed_date, created_at))"
+
+# Secondary indexes backing the list, dashboard and report orderings; the report
+# indexes are on the same expressions the report queries filter and sort by. tag_number
+# is already covered by the UNIQUE constraint's automatic index.
+TAG_INDEXES = {
+    "idx_tags_is_closed_updated": "CREATE INDEX IF NOT EXISTS idx_tags_is_closed_updated "
+    "ON tags(is_closed, updated_at DESC, id DESC)",
+    "idx_tags_updated_at": "CREATE INDEX IF NOT EXISTS idx_tags_updated_at "
+    "ON tags(updated_at DESC)",
+    "idx_tags_created_at": "CREATE INDEX IF NOT EXISTS idx_tags_created_at "
+    "ON tags(created_at DESC, id DESC)",
+    "idx_tags_report_date": "CREATE INDEX IF NOT EXISTS idx_tags_report_date "
+    f"ON tags(is_closed, {REPORT_DATE_EXPR}, tag_number)",
+    "idx_tags_closed_date": "CREATE INDEX IF NOT EXISTS idx_tags_closed_date "
+    "ON tags(is_closed, date(closed_date), tag_number)",
+}
+
+TAG_PAGE_SIZE = 50
+
+# Dropdown options only change on reseed, so each connection keeps its last
+# read. ``PRAGMA data_version`` on that connection moves when any other
+# connection commits, including a ``flask reseed`` run in another process;
+# ``_dropdown_version`` covers writes this process makes on the same
+# connection, which data_version does not report.
+_dropdown_version = 0
+
+
+# journal_mode is stored in the database file, so it only needs setting once per
+# path; the other pragmas are per-connection.
+_wal_enabled: set[str] = set()
+
+
+def now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with seconds precision."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+
+
+# (data_version, _dropdown_version) key, option lists, option frozensets.
+_DropdownCache = Tuple[Tuple[int, int], Dict[str, List[str]], Dict[str, FrozenSet[str]]]
+
+
+class Connection(sqlite3.Connection):
+    """SQLite connection that also carries this module's per-connection caches."""
+
+    dropdown_cache: Optional[_DropdownCache] = None
+
+
+def get_connection(db_path: Path | None = None, check_same_thread: bool = True) -> Connection:
     path = db_path or DB_PATH
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(path, factory=Connection, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
+    key = str(Path(path).resolve())
+    if key not in _wal_enabled:
+        conn.execute("PRAGMA journal_mode = WAL")
+        _wal_enabled.add(key)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -20000")
+    conn.execute("PRAGMA mmap_size = 134217728")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
 
@@ -92,37 +164,53 @@ def init_db(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    create_tag_indexes(conn)
     conn.commit()
 
 
-def upsert_dropdowns(conn: sqlite3.Connection, dropdowns: Dict[str, List[str]]) -> None:
+def create_tag_indexes(conn: sqlite3.Connection) -> None:
+    for ddl in TAG_INDEXES.values():
+        conn.execute(ddl)
+
+
+def _write_dropdowns(conn: sqlite3.Connection, dropdowns: Dict[str, List[str]]) -> None:
     for field, options in dropdowns.items():
         conn.execute("DELETE FROM dropdown_options WHERE field = ?", (field,))
         conn.executemany(
             "INSERT OR IGNORE INTO dropdown_options(field, value) VALUES (?, ?)",
             [(field, opt) for opt in options],
         )
+
+
+def upsert_dropdowns(conn: sqlite3.Connection, dropdowns: Dict[str, List[str]]) -> None:
+    _write_dropdowns(conn, dropdowns)
     conn.commit()
+    invalidate_dropdown_cache()
+
+
+def invalidate_dropdown_cache() -> None:
+    global _dropdown_version
+    _dropdown_version += 1
+
+
+_COMPLETE_VALUES = frozenset({"yes", "y", "true", "closed", "complete", "1", "done"})
 
 
 def determine_is_closed(record: Dict[str, Optional[str]]) -> int:
-    closed_date = (record.get("closed_date") or "").strip()
-    complete = (record.get("complete") or "").strip().lower()
-    if closed_date:
-        return 1
-    if complete in {"yes", "y", "true", "closed", "complete"}:
+    closed_date = record.get("closed_date")
+    if closed_date and closed_date.strip():
         return 1
-    if complete in {"1", "closed", "done"}:
+    complete = record.get("complete")
+    if complete and complete.strip().lower() in _COMPLETE_VALUES:
         return 1
     return 0
 
 
 def clean_record(record: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
     cleaned: Dict[str, Optional[str]] = {}
-    for key in TAG_COLUMNS:
-        if key not in record:
+    for key, value in record.items():
+        if key not in _TAG_COLUMN_SET:
             continue
-        value = record.get(key)
         if value is None:
             cleaned[key] = None
             continue
@@ -134,26 +222,59 @@ def clean_record(record: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
     return cleaned
 
 
-def seed_from_excel(conn: sqlite3.Connection, records: List[Dict[str, Optional[str]]]) -> None:
-    now = datetime.utcnow().isoformat(timespec="seconds")
-    for record in records:
-        record = record.copy()
-        record.setdefault("created_at", now)
-        record.setdefault("updated_at", now)
-        record["is_closed"] = determine_is_closed(record)
-        cleaned = clean_record(record)
-        columns = [key for key in TAG_COLUMNS if key in cleaned]
-        placeholders = ", ".join(["?" for _ in columns])
-        column_names = ", ".join(columns)
-        values = [cleaned[col] for col in columns]
+def _seed_row(record: Dict[str, Optional[str]], now: str) -> Tuple[Optional[str], ...]:
+    record = record.copy()
+    record.setdefault("created_at", now)
+    record.setdefault("updated_at", now)
+    record["is_closed"] = determine_is_closed(record)
+    cleaned = clean_record(record)
+    return tuple(cleaned.get(col) for col in TAG_COLUMNS)
+
+
+def _write_seed_rows(conn: sqlite3.Connection, records: Iterable[Dict[str, Optional[str]]]) -> None:
+    now = now_iso()
+    # executemany pulls rows from the generator as it goes, so the records are
+    # never materialized as a second list.
+    rows = (_seed_row(record, now) for record in records)
+    try:
+        conn.executemany(SEED_SQL, rows)
+    except sqlite3.Error as exc:
+        raise RuntimeError(f"Failed to seed tags from Excel: {exc}")
+
+
+def seed_from_excel(conn: sqlite3.Connection, records: Iterable[Dict[str, Optional[str]]]) -> None:
+    """Insert Excel records; ``records`` may be a lazy iterator and is consumed once."""
+    with conn:
+        _write_seed_rows(conn, records)
+
+
+def reseed(
+    conn: sqlite3.Connection,
+    records: Iterable[Dict[str, Optional[str]]],
+    dropdowns: Dict[str, List[str]],
+) -> None:
+    """
+    Replace all tags and dropdown options in a single transaction.
+
+    Secondary indexes are dropped for the bulk insert and rebuilt afterwards.
+    """
+    init_db(conn)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            conn.execute(
-                f"INSERT OR IGNORE INTO tags({column_names}) VALUES ({placeholders})",
-                values,
-            )
-        except sqlite3.Error as exc:
-            raise RuntimeError(f"Failed to insert record for tag {record.get('tag_number')}: {exc}")
-    conn.commit()
+            for name in TAG_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.execute("DELETE FROM tags")
+            conn.execute("DELETE FROM dropdown_options")
+            _write_seed_rows(conn, records)
+            _write_dropdowns(conn, dropdowns)
+            create_tag_indexes(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        invalidate_dropdown_cache()
 
 
 def fetch_dropdowns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
@@ -166,80 +287,177 @@ def fetch_dropdowns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
     return dropdowns
 
 
+def _refresh_dropdown_cache(conn: sqlite3.Connection) -> _DropdownCache:
+    key = (conn.execute("PRAGMA data_version").fetchone()[0], _dropdown_version)
+    cached = getattr(conn, "dropdown_cache", None)
+    if cached is None or cached[0] != key:
+        dropdowns = fetch_dropdowns(conn)
+        sets = {field: frozenset(values) for field, values in dropdowns.items()}
+        cached = (key, dropdowns, sets)
+        if isinstance(conn, Connection):
+            conn.dropdown_cache = cached
+    return cached
+
+
+def cached_dropdowns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    """Return dropdown options, querying the database only after a change."""
+    return _refresh_dropdown_cache(conn)[1]
+
+
+def cached_dropdown_options(
+    conn: sqlite3.Connection,
+) -> Tuple[Dict[str, List[str]], Dict[str, FrozenSet[str]]]:
+    """Return the cached dropdown lists and their frozensets from one refresh check."""
+    _, dropdowns, sets = _refresh_dropdown_cache(conn)
+    return dropdowns, sets
+
+
 def generate_tag_number(conn: sqlite3.Connection) -> str:
     today = datetime.utcnow().strftime("%y%m%d")
     prefix = f"NC-{today}-"
+    # A range on tag_number lets SQLite probe the UNIQUE index instead of
+    # scanning every tag with LIKE. Suffixes are compared as integers so that
+    # -1000 follows -999; tags whose suffix is not all digits are ignored.
+    suffix_start = len(prefix) + 1
     result = conn.execute(
-        "SELECT COUNT(*) FROM tags WHERE tag_number LIKE ?",
-        (f"{prefix}%",),
+        """
+        SELECT MAX(CAST(substr(tag_number, ?) AS INTEGER))
+        FROM tags
+        WHERE tag_number >= ? AND tag_number < ?
+          AND substr(tag_number, ?) NOT GLOB '*[^0-9]*'
+        """,
+        (suffix_start, f"{prefix}0", f"{prefix}:", suffix_start),
     ).fetchone()
-    count = (result[0] or 0) + 1
-    return f"{prefix}{count:03d}"
+    last = result[0] or 0
+    return f"{prefix}{last + 1:03d}"
+
 
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    """
+    Run a bulk read with plain tuple rows and zip them into dicts.
+
+    ``sqlite3.Row`` resolves every name lookup by scanning its columns, which
+    adds up when templates read several fields from hundreds of rows.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    columns = [description[0] for description in cur.description]
+    return [dict(zip(columns, row)) for row in cur]
+
+
+def list_tags(
+    conn: sqlite3.Connection,
+    is_closed: Optional[bool] = None,
+    before: Optional[Tuple[Optional[str], int]] = None,
+    limit: int = TAG_PAGE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Return one page of tags, newest first.
 
-def list_tags(conn: sqlite3.Connection, is_closed: Optional[bool] = None) -> List[sqlite3.Row]:
-    if is_closed is None:
-        sql = "SELECT * FROM tags ORDER BY (created_at IS NULL), created_at DESC"
-        return conn.execute(sql).fetchall()
+    The full list is ordered by created_at and the open/closed lists by
+    updated_at, with id breaking ties and tags missing that timestamp last.
+    ``before`` is the (sort value, id) of the last row on the previous page;
+    a None sort value means that row was already in the untimestamped tail.
+    """
+    sort_column = "created_at" if is_closed is None else "updated_at"
+    filters = []
+    filter_params: List[Any] = []
+    if is_closed is not None:
+        filters.append("is_closed = ?")
+        filter_params.append(1 if is_closed else 0)
+    extra_columns = ""
     if is_closed is False:
         days_open_expr = (
             "CAST(julianday('now') - "
             "julianday(date(COALESCE(containment_date, date_authorized, created_at))) "
             "AS INTEGER)"
         )
+        extra_columns = f", {days_open_expr} AS days_open"
+
+    def fetch(
+        conditions: List[str], params: Tuple[Any, ...], order_by: str, count: int
+    ) -> List[Dict[str, Any]]:
+        where_parts = filters + conditions
+        where = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
         sql = f"""
-            SELECT
-                *,
-                {days_open_expr} AS days_open
+            SELECT *{extra_columns}
             FROM tags
-            WHERE is_closed = 0
-            ORDER BY (updated_at IS NULL), updated_at DESC
+            {where}
+            ORDER BY {order_by}
+            LIMIT ?
         """
-        return conn.execute(sql).fetchall()
-    sql = "SELECT * FROM tags WHERE is_closed = ? ORDER BY (updated_at IS NULL), updated_at DESC"
-    return conn.execute(sql, (1 if is_closed else 0,)).fetchall()
+        return _fetch_dicts(conn, sql, (*filter_params, *params, count))
+
+    if before is None:
+        return fetch([], (), f"{sort_column} DESC NULLS LAST, id DESC", limit)
+    before_value, before_id = before
+    rows: List[Dict[str, Any]] = []
+    tail_params: Tuple[Any, ...] = (before_id,)
+    if before_value is not None:
+        # A row-value comparison is NULL for rows without a timestamp, so this
+        # index range only covers timestamped rows; the NULL tail follows it.
+        rows = fetch(
+            [f"({sort_column}, id) < (?, ?)"],
+            (before_value, before_id),
+            f"{sort_column} DESC, id DESC",
+            limit,
+        )
+        tail_params = ()
+    if len(rows) < limit:
+        tail_conditions = [f"{sort_column} IS NULL"]
+        if tail_params:
+            tail_conditions.append("id < ?")
+        rows += fetch(tail_conditions, tail_params, "id DESC", limit - len(rows))
+    return rows
+
+
+def list_tags_page(
+    conn: sqlite3.Connection,
+    is_closed: Optional[bool] = None,
+    before: Optional[Tuple[Optional[str], int]] = None,
+    limit: int = TAG_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Optional[str], int]]]:
+    """Return a page of tags and the cursor for the next page, if any."""
+    rows = list_tags(conn, is_closed=is_closed, before=before, limit=limit + 1)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    sort_column = "created_at" if is_closed is None else "updated_at"
+    return rows, (last[sort_column], last["id"])
 
 
 def get_tag(conn: sqlite3.Connection, tag_id: int) -> Optional[sqlite3.Row]:
     return conn.execute("SELECT * FROM tags WHERE id = ?", (tag_id,)).fetchone()
 
 
-def insert_tag(conn: sqlite3.Connection, data: Dict[str, Optional[str]]) -> int:
-    now = datetime.utcnow().isoformat(timespec="seconds")
+def insert_tag(
+    conn: sqlite3.Connection, data: Dict[str, Optional[str]], now: Optional[str] = None
+) -> int:
+    now = now or now_iso()
     data = data.copy()
     data.setdefault("created_at", now)
     data.setdefault("updated_at", now)
     data["is_closed"] = determine_is_closed(data)
-    columns = [col for col in TAG_COLUMNS if col in data]
-    placeholders = ", ".join(["?" for _ in columns])
-    column_names = ", ".join(columns)
-    values = [data[col] for col in columns]
-    cur = conn.execute(
-        f"INSERT INTO tags({column_names}) VALUES ({placeholders})",
-        values,
-    )
+    cur = conn.execute(INSERT_SQL, tuple(data.get(col) for col in TAG_COLUMNS))
     conn.commit()
     return int(cur.lastrowid)
 
 
-def update_tag(conn: sqlite3.Connection, tag_id: int, data: Dict[str, Optional[str]]) -> None:
-    now = datetime.utcnow().isoformat(timespec="seconds")
+def update_tag(
+    conn: sqlite3.Connection,
+    tag_id: int,
+    data: Dict[str, Optional[str]],
+    now: Optional[str] = None,
+) -> None:
+    now = now or now_iso()
     data = data.copy()
     data["updated_at"] = now
     data["is_closed"] = determine_is_closed(data)
-    assignments = []
-    values: List[Optional[str]] = []
-    for col in TAG_COLUMNS:
-        if col in data:
-            assignments.append(f"{col} = ?")
-            values.append(data[col])
-    if not assignments:
-        return
+    values = [data.get(col) for col in UPDATE_COLUMNS]
     values.append(tag_id)
-    conn.execute(
-        f"UPDATE tags SET {', '.join(assignments)} WHERE id = ?",
-        values,
-    )
+    conn.execute(UPDATE_SQL, values)
     conn.commit()
 
 
@@ -250,78 +468,77 @@ def delete_tag(conn: sqlite3.Connection, tag_id: int) -> None:
 
 
 def dashboard_stats(conn: sqlite3.Connection) -> Dict[str, int]:
-    total = conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0]
-    open_count = conn.execute(
-        "SELECT COUNT(*) FROM tags WHERE is_closed = 0"
-    ).fetchone()[0]
-    closed_count = conn.execute(
-        "SELECT COUNT(*) FROM tags WHERE is_closed = 1"
-    ).fetchone()[0]
+    row = conn.execute(
+        """
+        SELECT
+            COUNT(*),
+            SUM(CASE WHEN is_closed = 0 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN is_closed = 1 THEN 1 ELSE 0 END)
+        FROM tags
+        """
+    ).fetchone()
     return {
-        "total": total,
-        "open": open_count,
-        "closed": closed_count,
+        "total": row[0],
+        "open": row[1] or 0,
+        "closed": row[2] or 0,
     }
 
 
 def report_rows_open(
     conn: sqlite3.Connection, start_date: str, end_date: str
-) -> List[sqlite3.Row]:
+) -> List[Dict[str, Any]]:
     """
     Return open tag records whose primary date falls within the given range.
 
     The primary date prefers containment, authorization, or closed dates,
     falling back to created_at when the others are missing.
     """
-    report_date_expr = "date(COALESCE(containment_date, date_authorized, closed_date, created_at))"
-    days_open_expr = f"CAST(julianday('now') - julianday({report_date_expr}) AS INTEGER)"
+    days_open_expr = "CAST(julianday('now') - julianday(report_date) AS INTEGER)"
     sql = f"""
         SELECT
             *,
-            {report_date_expr} AS report_date,
             {days_open_expr} AS days_open
-        FROM tags
-        WHERE is_closed = 0
-          AND {report_date_expr} BETWEEN ? AND ?
-        ORDER BY {report_date_expr} DESC, tag_number DESC
+        FROM (
+            SELECT *, {REPORT_DATE_EXPR} AS report_date
+            FROM tags
+            WHERE is_closed = 0
+        )
+        WHERE report_date BETWEEN ? AND ?
+        ORDER BY report_date DESC, tag_number DESC
     """
-    return conn.execute(sql, (start_date, end_date)).fetchall()
+    return _fetch_dicts(conn, sql, (start_date, end_date))
 
 
 def report_rows_closed(
     conn: sqlite3.Connection, start_date: str, end_date: str
-) -> List[sqlite3.Row]:
+) -> List[Dict[str, Any]]:
     """
     Return closed tag records with a closed date within the given range.
     """
-    report_date_expr = "date(COALESCE(containment_date, date_authorized, closed_date, created_at))"
     sql = f"""
         SELECT
             *,
-            {report_date_expr} AS report_date
+            {REPORT_DATE_EXPR} AS report_date
         FROM tags
         WHERE is_closed = 1
           AND date(closed_date) BETWEEN ? AND ?
         ORDER BY date(closed_date) DESC, tag_number DESC
     """
-    return conn.execute(sql, (start_date, end_date)).fetchall()
+    return _fetch_dicts(conn, sql, (start_date, end_date))
 
 
-def report_summary(rows: Iterable[sqlite3.Row]) -> Dict[str, int]:
-    rows_list = rows if isinstance(rows, list) else list(rows)
-    total = len(rows_list)
-    open_count = sum(1 for row in rows_list if not row["is_closed"])
-    closed_count = total - open_count
-    return {"total": total, "open": open_count, "closed": closed_count}
+def report_summary(rows: List[Dict[str, Any]], closed: bool) -> Dict[str, int]:
+    """Counts for a report's rows; each report holds only open or only closed tags."""
+    total = len(rows)
+    return {"total": total, "open": 0 if closed else total, "closed": total if closed else 0}
 
 
 def report_row_open(conn: sqlite3.Connection, tag_id: int) -> Optional[sqlite3.Row]:
-    report_date_expr = "date(COALESCE(containment_date, date_authorized, closed_date, created_at))"
-    days_open_expr = f"CAST(julianday('now') - julianday({report_date_expr}) AS INTEGER)"
+    days_open_expr = f"CAST(julianday('now') - julianday({REPORT_DATE_EXPR}) AS INTEGER)"
     sql = f"""
         SELECT
             *,
-            {report_date_expr} AS report_date,
+            {REPORT_DATE_EXPR} AS report_date,
             {days_open_expr} AS days_open
         FROM tags
         WHERE id = ?
@@ -331,11 +548,10 @@ def report_row_open(conn: sqlite3.Connection, tag_id: int) -> Optional[sqlite3.R
 
 
 def report_row_closed(conn: sqlite3.Connection, tag_id: int) -> Optional[sqlite3.Row]:
-    report_date_expr = "date(COALESCE(containment_date, date_authorized, closed_date, created_at))"
     sql = f"""
         SELECT
             *,
-            {report_date_expr} AS report_date
+            {REPORT_DATE_EXPR} AS report_date
         FROM tags
         WHERE id = ?
           AND is_closed = 1
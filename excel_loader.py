@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import io
 import re
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
 import xml.etree.ElementTree as ET
 
 NAMESPACE_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Qualified (Clark-notation) tag names, built once rather than per lookup.
+SHEET_PATH = f"{{{NAMESPACE_MAIN}}}sheets/{{{NAMESPACE_MAIN}}}sheet"
+REL_ID_ATTR = f"{{{REL_NS}}}id"
+RELATIONSHIP_TAG = f"{{{PACKAGE_REL_NS}}}Relationship"
+SHEET_DATA_TAG = f"{{{NAMESPACE_MAIN}}}sheetData"
+ROW_TAG = f"{{{NAMESPACE_MAIN}}}row"
+C_TAG = f"{{{NAMESPACE_MAIN}}}c"
+V_TAG = f"{{{NAMESPACE_MAIN}}}v"
+SI_TAG = f"{{{NAMESPACE_MAIN}}}si"
+T_TAG = f"{{{NAMESPACE_MAIN}}}t"
 
 FIELD_MAP = {
     "A": "tag_number",
@@ -49,8 +65,14 @@ DATE_FIELDS = {
 }
 
 BASE_DATE = datetime(1899, 12, 30)  # Excel serial 1
+BASE_ORDINAL = BASE_DATE.toordinal()
+
+STREAM_BUFFER_SIZE = 1 << 16
 
+_CELL_REF_RE = re.compile(r"([A-Z]+)([0-9]+)")
 
+
+@lru_cache(maxsize=8192)
 def excel_serial_to_iso(value: str) -> Optional[str]:
     """Convert an Excel serial (stored as string) to ISO date, or None."""
     if value is None:
@@ -58,24 +80,98 @@ def excel_serial_to_iso(value: str) -> Optional[str]:
     text = value.strip()
     if not text:
         return None
+    # Date serials are almost always plain integers; skip the float parse.
+    if text.isdecimal():
+        days = int(text)
+    else:
+        try:
+            days = int(float(text))
+        except (ValueError, OverflowError):
+            return None
     try:
-        serial = float(text)
-    except ValueError:
-        return None
-    # Guard against Excel bug where 60 is 1900-02-29
-    days = int(serial)
-    try:
-        date_value = BASE_DATE + timedelta(days=days)
-    except OverflowError:
+        return date.fromordinal(BASE_ORDINAL + days).isoformat()
+    except (ValueError, OverflowError):
         return None
-    return date_value.date().isoformat()
+
+
+def parse_log_rows(
+    rows: Iterable[ET.Element],
+    shared_strings: Optional[List[str]],
+    stripped_strings: List[Optional[str]],
+) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Turn NC Log ``row`` elements into records, skipping rows with no text.
+
+    This is the loader's per-cell hot loop. It depends only on its arguments;
+    ``stripped_strings`` parallels ``shared_strings`` and is filled in as
+    shared strings are first used, so each one is stripped once.
+    """
+    # Bound locally: these are hit for every cell of every row.
+    field_for_column = FIELD_MAP.get
+    date_fields = DATE_FIELDS
+    to_iso = excel_serial_to_iso
+    cell_tag = C_TAG
+    value_tag = V_TAG
+    for row in rows:
+        row_index = int(row.get("r", "0"))
+        if row_index < 7:  # skip headers and intro blocks
+            continue
+        record: Dict[str, Optional[str]] = {}
+        for cell in row.iterfind(cell_tag):
+            # Stripping the row digits leaves the column letters; most
+            # columns are not mapped, so they drop out without a regex.
+            field = field_for_column(cell.get("r", "").rstrip("0123456789"))
+            if not field:
+                continue
+            v = cell.find(value_tag)
+            if v is None:
+                continue
+            raw = v.text or ""
+            if cell.get("t") == "s" and shared_strings:
+                index = int(raw)
+                value = stripped_strings[index]
+                if value is None:
+                    value = stripped_strings[index] = shared_strings[index].strip()
+            else:
+                value = raw.strip()
+            if not value:
+                continue
+            if field in date_fields:
+                record[field] = to_iso(value) or value
+            else:
+                record[field] = value
+        if record:
+            yield record
 
 
 @dataclass
 class ExcelData:
-    records: List[Dict[str, Optional[str]]]
+    """
+    Parsed workbook contents.
+
+    ``records`` is stored column-wise: one list per field, all the same
+    length, holding None where a row has no value.
+    """
+
+    records: Dict[str, List[Optional[str]]]
     dropdowns: Dict[str, List[str]]
 
+    @property
+    def row_count(self) -> int:
+        return len(next(iter(self.records.values()), []))
+
+    def row(self, index: int) -> Dict[str, Optional[str]]:
+        """Return one record as a dict holding only the fields it has."""
+        return {
+            field: values[index]
+            for field, values in self.records.items()
+            if values[index] is not None
+        }
+
+    def iter_rows(self) -> Iterator[Dict[str, Optional[str]]]:
+        for index in range(self.row_count):
+            yield self.row(index)
+
 
 class NonconExcelLoader:
     def __init__(self, workbook_path: Path):
@@ -83,40 +179,103 @@ class NonconExcelLoader:
         if not self.workbook_path.exists():
             raise FileNotFoundError(f"Workbook not found: {self.workbook_path}")
         self._zip: zipfile.ZipFile | None = None
+        self._entries: Dict[str, zipfile.ZipInfo] = {}
         self._shared_strings: List[str] | None = None
+        self._stripped_strings: List[Optional[str]] = []
+        self._needle_indices: Dict[str, List[int]] = {}
+        # Sheet XML already decompressed during discovery, and discovery
+        # answers, so no sheet is inflated or searched twice.
+        self._sheet_bytes: Dict[str, bytes] = {}
+        self._contains_cache: Dict[Tuple[str, str], bool] = {}
 
     def load(self) -> ExcelData:
         with zipfile.ZipFile(self.workbook_path) as zf:
-            self._zip = zf
-            self._shared_strings = self._read_shared_strings(zf)
-            sheet_targets = self._sheet_targets(zf)
-
-            log_sheet_path = self._find_log_sheet(zf, sheet_targets)
-            if not log_sheet_path:
-                raise ValueError("Could not locate NC Log worksheet in workbook.")
+            sheet_targets = self._open_workbook(zf)
+            log_sheet_path = self._locate_log_sheet(zf, sheet_targets)
             dropdown_sheet_path = self._find_dropdown_sheet(zf, sheet_targets)
             if not dropdown_sheet_path:
                 raise ValueError("Could not locate dropdown worksheet in workbook.")
+            self._keep_sheet_bytes(log_sheet_path, dropdown_sheet_path)
 
             records = self._read_log_records(zf, log_sheet_path)
             dropdowns = self._read_dropdowns(zf, dropdown_sheet_path)
             return ExcelData(records=records, dropdowns=dropdowns)
 
+    def iter_records(self) -> Iterator[Dict[str, Optional[str]]]:
+        """
+        Yield NC Log records one at a time as the sheet is parsed.
+
+        Only the log sheet is read and memory stays at one row, so callers
+        that stop early never pay for the rest of the workbook.
+        """
+        with zipfile.ZipFile(self.workbook_path) as zf:
+            sheet_targets = self._open_workbook(zf)
+            log_sheet_path = self._locate_log_sheet(zf, sheet_targets)
+            self._keep_sheet_bytes(log_sheet_path)
+            rows = self._iter_rows(zf, log_sheet_path)
+            yield from parse_log_rows(rows, self._shared_strings, self._stripped_strings)
+
     # Internal helpers -------------------------------------------------
 
+    def _open_workbook(self, zf: zipfile.ZipFile) -> Dict[str, str]:
+        """Read the workbook-wide parts and return the sheet name -> path map."""
+        self._zip = zf
+        # Resolve member names once; open/read then take the ZipInfo directly.
+        self._entries = {info.filename: info for info in zf.infolist()}
+        self._shared_strings = self._read_shared_strings(zf)
+        self._stripped_strings = [None] * len(self._shared_strings)
+        return self._sheet_targets(zf)
+
+    def _keep_sheet_bytes(self, *paths: str) -> None:
+        """Drop sheet bytes cached during discovery except for ``paths``."""
+        for path in list(self._sheet_bytes):
+            if path not in paths:
+                del self._sheet_bytes[path]
+
+    def _locate_log_sheet(self, zf: zipfile.ZipFile, sheet_targets: Dict[str, str]) -> str:
+        log_sheet_path = self._find_log_sheet(zf, sheet_targets)
+        if not log_sheet_path:
+            raise ValueError("Could not locate NC Log worksheet in workbook.")
+        return log_sheet_path
+
+    def _open_part(
+        self, zf: zipfile.ZipFile, path: str, consume: bool = False
+    ) -> io.BufferedIOBase:
+        """
+        Open a workbook part for streaming, decompressing in 64 KiB reads.
+
+        Parts already read by ``_sheet_bytes_for`` are served from memory;
+        ``consume`` drops the cached copy once the caller is its last reader.
+        """
+        if consume:
+            data = self._sheet_bytes.pop(path, None)
+        else:
+            data = self._sheet_bytes.get(path)
+        if data is not None:
+            return io.BytesIO(data)
+        return io.BufferedReader(zf.open(self._entries[path]), buffer_size=STREAM_BUFFER_SIZE)
+
+    def _sheet_bytes_for(self, zf: zipfile.ZipFile, path: str) -> bytes:
+        data = self._sheet_bytes.get(path)
+        if data is None:
+            data = self._sheet_bytes[path] = zf.read(self._entries[path])
+        return data
+
     def _sheet_targets(self, zf: zipfile.ZipFile) -> Dict[str, str]:
-        workbook_xml = ET.fromstring(zf.read("xl/workbook.xml"))
+        with self._open_part(zf, "xl/workbook.xml") as stream:
+            workbook_xml = ET.parse(stream).getroot()
         sheets = []
-        for sheet in workbook_xml.findall(f"{{{NAMESPACE_MAIN}}}sheets/{{{NAMESPACE_MAIN}}}sheet"):
+        for sheet in workbook_xml.findall(SHEET_PATH):
             name = sheet.attrib.get("name", "")
-            rid = sheet.attrib.get(f"{{{REL_NS}}}id")
+            rid = sheet.attrib.get(REL_ID_ATTR)
             if rid:
                 sheets.append((name, rid))
 
-        rels_xml = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        with self._open_part(zf, "xl/_rels/workbook.xml.rels") as stream:
+            rels_xml = ET.parse(stream).getroot()
         rels = {
             rel.attrib["Id"]: rel.attrib["Target"]
-            for rel in rels_xml.findall("{http://schemas.openxmlformats.org/package/2006/relationships}Relationship")
+            for rel in rels_xml.findall(RELATIONSHIP_TAG)
             if rel.attrib.get("Type", "").endswith("/worksheet")
         }
 
@@ -154,27 +313,68 @@ class NonconExcelLoader:
                 return path
         return None
 
+    def _sheet_may_contain(self, zf: zipfile.ZipFile, path: str, needle: str) -> bool:
+        """
+        Cheap byte-level pre-check for ``_sheet_contains_text``.
+
+        A False result is definitive. A cell matches either through its own
+        text or through a shared string, which the sheet references as
+        ``>index<``; if neither appears in the raw XML there is nothing to
+        parse. A True result still needs confirming, since an index can
+        collide with a plain number.
+        """
+        data = self._sheet_bytes_for(zf, path).lower()
+        if escape(needle).encode("utf-8") in data:
+            return True
+        indices = self._needle_indices.get(needle)
+        if indices is None:
+            indices = [
+                index
+                for index, text in enumerate(self._shared_strings or [])
+                if needle in text.lower()
+            ]
+            self._needle_indices[needle] = indices
+        return any(b">%d<" % index in data for index in indices)
+
     def _sheet_contains_text(self, zf: zipfile.ZipFile, path: str, needle: str) -> bool:
-        root = ET.fromstring(zf.read(path))
-        for cell in root.findall(f"{{{NAMESPACE_MAIN}}}sheetData/{{{NAMESPACE_MAIN}}}row/{{{NAMESPACE_MAIN}}}c"):
-            value = self._cell_value(cell)
-            if value and needle.lower() in value.lower():
-                return True
+        needle = needle.lower()
+        key = (path, needle)
+        found = self._contains_cache.get(key)
+        if found is None:
+            found = self._contains_cache[key] = self._search_sheet(zf, path, needle)
+        return found
+
+    def _search_sheet(self, zf: zipfile.ZipFile, path: str, needle: str) -> bool:
+        if not self._sheet_may_contain(zf, path, needle):
+            return False
+        # Stream cells so a match near the top of the sheet stops the parse.
+        with self._open_part(zf, path) as stream:
+            for _, cell in ET.iterparse(stream, events=("end",)):
+                if cell.tag != C_TAG:
+                    continue
+                value = self._cell_value(cell)
+                if value and needle in value.lower():
+                    return True
+                cell.clear()
         return False
 
     def _read_shared_strings(self, zf: zipfile.ZipFile) -> List[str]:
         try:
-            root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
+            stream = self._open_part(zf, "xl/sharedStrings.xml")
         except KeyError:
             return []
         strings: List[str] = []
-        for si in root.findall(f"{{{NAMESPACE_MAIN}}}si"):
-            text_parts = [t.text or "" for t in si.findall(f".//{{{NAMESPACE_MAIN}}}t")]
-            strings.append("".join(text_parts))
+        with stream:
+            for _, si in ET.iterparse(stream, events=("end",)):
+                if si.tag != SI_TAG:
+                    continue
+                # Rich-text entries split their text across several runs.
+                strings.append("".join([t.text or "" for t in si.iter(T_TAG)]))
+                si.clear()
         return strings
 
     def _cell_value(self, cell: ET.Element) -> Optional[str]:
-        v = cell.find(f"{{{NAMESPACE_MAIN}}}v")
+        v = cell.find(V_TAG)
         if v is None:
             return None
         cell_type = cell.attrib.get("t")
@@ -184,76 +384,82 @@ class NonconExcelLoader:
             return shared
         return raw
 
-    def _read_log_records(self, zf: zipfile.ZipFile, path: str) -> List[Dict[str, Optional[str]]]:
-        sheet = ET.fromstring(zf.read(path))
-        records: List[Dict[str, Optional[str]]] = []
-        rows = sheet.findall(f"{{{NAMESPACE_MAIN}}}sheetData/{{{NAMESPACE_MAIN}}}row")
-        for row in rows:
-            row_index = int(row.attrib.get("r", "0"))
-            if row_index < 7:  # skip headers and intro blocks
-                continue
-            record: Dict[str, Optional[str]] = {}
-            has_text = False
-            for cell in row.findall(f"{{{NAMESPACE_MAIN}}}c"):
-                match = re.match(r"([A-Z]+)", cell.attrib.get("r", ""))
-                if not match:
-                    continue
-                column = match.group(1)
-                field = FIELD_MAP.get(column)
-                if not field:
-                    continue
-                value = self._cell_value(cell)
-                if value is None:
+    def _iter_rows(self, zf: zipfile.ZipFile, path: str) -> Iterator[ET.Element]:
+        """
+        Stream the ``row`` elements of a worksheet.
+
+        Each row is removed from the tree once the caller moves on, so memory
+        stays bounded by a single row rather than the whole sheet.
+        """
+        sheet_data = None
+        with self._open_part(zf, path, consume=True) as stream:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == SHEET_DATA_TAG:
+                        sheet_data = elem
                     continue
-                value = value.strip()
-                if not value:
+                if elem.tag != ROW_TAG:
                     continue
-                has_text = True
-                if field in DATE_FIELDS:
-                    iso = excel_serial_to_iso(value)
-                    record[field] = iso or value
-                else:
-                    record[field] = value
-            if has_text:
-                records.append(record)
-        return records
+                yield elem
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+
+    def _read_log_records(self, zf: zipfile.ZipFile, path: str) -> Dict[str, List[Optional[str]]]:
+        columns: Dict[str, List[Optional[str]]] = {field: [] for field in FIELD_MAP.values()}
+        column_items = tuple(columns.items())
+        rows = self._iter_rows(zf, path)
+        for record in parse_log_rows(rows, self._shared_strings, self._stripped_strings):
+            for field, values in column_items:
+                values.append(record.get(field))
+        return columns
 
     def _read_dropdowns(self, zf: zipfile.ZipFile, path: str) -> Dict[str, List[str]]:
-        sheet = ET.fromstring(zf.read(path))
         dropdowns = {
             "rejection_type": [],
             "rejection_class": [],
             "disposition": [],
         }
-        for cell in sheet.findall(f"{{{NAMESPACE_MAIN}}}sheetData/{{{NAMESPACE_MAIN}}}row/{{{NAMESPACE_MAIN}}}c"):
-            match = re.match(r"([A-Z]+)([0-9]+)", cell.attrib.get("r", ""))
-            if not match:
-                continue
-            column, row_no = match.groups()
-            if row_no == "1":
-                continue  # skip headers
-            value = self._cell_value(cell)
-            if not value:
-                continue
-            value = value.strip()
-            if column == "A":
-                dropdowns["rejection_type"].append(value)
-            elif column == "C":
-                dropdowns["rejection_class"].append(value)
-            elif column == "E":
-                dropdowns["disposition"].append(value)
+        for row in self._iter_rows(zf, path):
+            for cell in row.findall(C_TAG):
+                match = _CELL_REF_RE.match(cell.attrib.get("r", ""))
+                if not match:
+                    continue
+                column, row_no = match.groups()
+                if row_no == "1":
+                    continue  # skip headers
+                value = self._cell_value(cell)
+                if not value:
+                    continue
+                value = value.strip()
+                if column == "A":
+                    dropdowns["rejection_type"].append(value)
+                elif column == "C":
+                    dropdowns["rejection_class"].append(value)
+                elif column == "E":
+                    dropdowns["disposition"].append(value)
         # Deduplicate while preserving order
         for key, values in dropdowns.items():
-            seen = set()
-            unique: List[str] = []
-            for item in values:
-                if item not in seen:
-                    unique.append(item)
-                    seen.add(item)
-            dropdowns[key] = unique
+            dropdowns[key] = list(dict.fromkeys(values))
         return dropdowns
 
 
 def load_excel(workbook_path: Path | str) -> ExcelData:
     loader = NonconExcelLoader(Path(workbook_path))
     return loader.load()
+
+
+def iter_excel_records(workbook_path: Path | str) -> Iterator[Dict[str, Optional[str]]]:
+    loader = NonconExcelLoader(Path(workbook_path))
+    return loader.iter_records()
+
+
+def load_many(
+    workbook_paths: Iterable[Path | str], max_workers: Optional[int] = None
+) -> List[ExcelData]:
+    """Load several workbooks in parallel worker processes, preserving order."""
+    paths = [Path(path) for path in workbook_paths]
+    if len(paths) <= 1:
+        return [load_excel(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(load_excel, paths))